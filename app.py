@@ -1,17 +1,21 @@
 import streamlit as st
 import pandas as pd
-import re
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import os
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import spacy
-from collections import Counter
 from wordcloud import WordCloud, STOPWORDS
-import matplotlib.pyplot as plt
 
 analyzer = SentimentIntensityAnalyzer()
 
 @st.cache_resource
 def load_spacy_model():
+    import spacy
     try:
         nlp = spacy.load("en_core_web_sm", disable=['parser', 'tagger', 'lemmatizer'])
         return nlp
@@ -19,54 +23,135 @@ def load_spacy_model():
         st.error("SpaCy model 'en_core_web_sm' not found. Please run 'python -m spacy download en_core_web_sm' first.")
         st.stop()
 
-nlp = load_spacy_model()
-
-def clean_tweet_for_wordcloud(tweet):
-    tweet = str(tweet)
-    tweet = re.sub(r'RT[\s]+', '', tweet)
-    tweet = re.sub(r'https?:\/\/\S+', '', tweet)
-    tweet = re.sub(r'@[A-Za-z0-9]+', '', tweet)
-    tweet = re.sub(r'[^A-Za-z\s]', '', tweet)
-    tweet = tweet.lower()
-    return ' '.join(tweet.split())
-
-def clean_tweet_for_sentiment(tweet):
-     tweet = str(tweet)
-     return ' '.join(re.sub(r"(@[A-Za-z0-9]+)|([^0-9A-Za-z \t])|(\w+:\/\/\S+)", " ", tweet).split())
-
-def get_vader_sentiment_label(tweet):
-    cleaned_tweet = clean_tweet_for_sentiment(tweet)
-    vs = analyzer.polarity_scores(cleaned_tweet)
-    if vs['compound'] >= 0.05: return 'Positive'
-    elif vs['compound'] <= -0.05: return 'Negative'
-    else: return 'Neutral'
-
-def get_vader_compound_score(tweet):
-    cleaned_tweet = clean_tweet_for_sentiment(tweet)
-    vs = analyzer.polarity_scores(cleaned_tweet)
-    return vs['compound']
-
-def extract_entities(text):
-    doc = nlp(str(text))
-    entities = [(ent.text, ent.label_) for ent in doc.ents]
-    return entities
-
-@st.cache_data
-def load_data(file_path="tweets.csv"):
+# Kept as pattern strings: on string[pyarrow] columns pandas hands these to Arrow's RE2-based
+# replace_substring_regex kernel, whereas a compiled re.Pattern falls back to per-row Python re.
+# RE2's \w and \s are ASCII-only (and \s skips \v), so these classes spell out what Python's
+# \s and str.split() treat as whitespace.
+WHITESPACE_CLASS = r"\s\pZ\x0b\x1c-\x1f\x85"
+WORDCLOUD_CLEAN_PATTERN = rf"RT[{WHITESPACE_CLASS}]+|https?://[^{WHITESPACE_CLASS}]+|@[A-Za-z0-9]+|[^A-Za-z{WHITESPACE_CLASS}]"
+SENTIMENT_CLEAN_PATTERN = rf"(@[A-Za-z0-9]+)|([^0-9A-Za-z \t])|([\pL\pN_]+://[^{WHITESPACE_CLASS}]+)"
+
+def collapse_whitespace(texts):
+    return texts.str.replace(rf"[{WHITESPACE_CLASS}]+", " ", regex=True).str.strip()
+
+def clean_tweets_for_wordcloud(texts):
+    return collapse_whitespace(texts.str.replace(WORDCLOUD_CLEAN_PATTERN, '', regex=True).str.lower())
+
+def clean_tweets_for_sentiment(texts):
+    return collapse_whitespace(texts.str.replace(SENTIMENT_CLEAN_PATTERN, ' ', regex=True))
+
+PARALLEL_MIN_ROWS = 5000
+
+def parallel_workers(n_rows):
+    return max(1, (os.cpu_count() or 1) - 1) if n_rows >= PARALLEL_MIN_ROWS else 1
+
+MAX_VADER_CHARS = 400
+
+def has_lexicon_token(text):
+    return any(word.lower() in analyzer.lexicon for word in text.split())
+
+@functools.lru_cache(maxsize=4096)
+def vader_compound(cleaned_tweet):
+    cleaned_tweet = cleaned_tweet[:MAX_VADER_CHARS]
+    if not has_lexicon_token(cleaned_tweet):
+        return 0.0
+    return analyzer.polarity_scores(cleaned_tweet)['compound']
+
+def vader_compound_scores(cleaned_tweets):
+    return [vader_compound(tweet) for tweet in cleaned_tweets]
+
+def score_vader_sentiment(cleaned_tweets):
+    workers = parallel_workers(len(cleaned_tweets))
+    if workers > 1:
+        chunks = np.array_split(cleaned_tweets.to_numpy(), workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            compound_scores = chain.from_iterable(executor.map(vader_compound_scores, chunks))
+            scores = np.fromiter(compound_scores, dtype=np.float32, count=len(cleaned_tweets))
+    else:
+        scores = np.fromiter((vader_compound(tweet) for tweet in cleaned_tweets),
+                             dtype=np.float32, count=len(cleaned_tweets))
+    labels = np.select([scores >= 0.05, scores <= -0.05], ['Positive', 'Negative'], default='Neutral')
+    return labels, scores
+
+NER_BATCH_SIZE = 256
+# Parquet names the list child "element"; using the same name lets the sidecar round-trip to this exact type.
+ENTITIES_TYPE = pa.list_(pa.field('element', pa.struct([('text', pa.string()), ('label', pa.string())])))
+ENTITIES_DTYPE = pd.ArrowDtype(ENTITIES_TYPE)
+
+def extract_entities(texts):
+    docs = load_spacy_model().pipe(texts, batch_size=NER_BATCH_SIZE, n_process=parallel_workers(len(texts)))
+    entities = [[{'text': ent.text, 'label': ent.label_} for ent in doc.ents] for doc in docs]
+    return pd.arrays.ArrowExtensionArray(pa.array(entities, type=ENTITIES_TYPE))
+
+ARROW_STRING_COLUMNS = ['text', 'user', 'url', 'cleaned_text']
+SENTIMENT_DTYPE = pd.CategoricalDtype(['Positive', 'Neutral', 'Negative'])
+
+def compact_string_columns(df):
+    for column in ARROW_STRING_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('string[pyarrow]')
+    if 'topic' in df.columns:
+        df['topic'] = df['topic'].astype('category')
+    if 'sentiment' in df.columns:
+        df['sentiment'] = df['sentiment'].astype(SENTIMENT_DTYPE)
+    return df
+
+def enriched_cache_paths(file_path):
+    base_path = os.path.splitext(file_path)[0]
+    return base_path + ".enriched.parquet", base_path + ".enriched.key"
+
+def csv_data_version(file_path):
     try:
+        return f"{os.path.getmtime(file_path)}:{os.path.getsize(file_path)}"
+    except OSError:
+        return None
+
+def read_enriched_cache(file_path, data_version):
+    parquet_path, key_path = enriched_cache_paths(file_path)
+    try:
+        with open(key_path) as key_file:
+            if key_file.read() != data_version:
+                return None
+        table = pq.read_table(parquet_path)
+    except (OSError, ValueError):
+        return None
+    df = table.to_pandas(ignore_metadata=True, types_mapper={ENTITIES_TYPE: ENTITIES_DTYPE}.get)
+    return compact_string_columns(df)
+
+def write_enriched_cache(df, file_path, data_version):
+    if data_version is None:
+        return
+    parquet_path, key_path = enriched_cache_paths(file_path)
+    try:
+        df.to_parquet(parquet_path, index=False)
+        with open(key_path, "w") as key_file:
+            key_file.write(data_version)
+    except OSError:
+        pass
+
+@st.cache_data(max_entries=1, show_spinner="Preparing tweet dataset…")
+def load_data(file_path="tweets.csv", data_version=None):
+    try:
+        cached_df = read_enriched_cache(file_path, data_version)
+        if cached_df is not None:
+            return cached_df
         df = pd.read_csv(file_path)
         if 'text' in df.columns:
-            df['text'] = df['text'].fillna('')
-            if 'sentiment' not in df.columns or df['sentiment'].isnull().any():
-                 df['sentiment'] = df['text'].apply(get_vader_sentiment_label)
-            if 'vader_score' not in df.columns or df['vader_score'].isnull().any():
-                 df['vader_score'] = df['text'].apply(get_vader_compound_score)
-            if 'entities' not in df.columns or not isinstance(df.get('entities', [None])[0], list):
-                 df['entities'] = df['text'].apply(extract_entities)
+            df['text'] = df['text'].fillna('').astype('string[pyarrow]')
+            needs_sentiment = 'sentiment' not in df.columns or df['sentiment'].isnull().any()
+            needs_score = 'vader_score' not in df.columns or df['vader_score'].isnull().any()
+            if needs_sentiment or needs_score:
+                 labels, scores = score_vader_sentiment(clean_tweets_for_sentiment(df['text']))
+                 if needs_sentiment: df['sentiment'] = labels
+                 if needs_score: df['vader_score'] = scores
+            if 'entities' not in df.columns or df['entities'].dtype != ENTITIES_DTYPE:
+                 df['entities'] = extract_entities(df['text'].tolist())
             if 'polarity' in df.columns:
                 df = df.drop(columns=['polarity'])
             if 'cleaned_text' not in df.columns:
-                 df['cleaned_text'] = df['text'].apply(clean_tweet_for_wordcloud)
+                 df['cleaned_text'] = clean_tweets_for_wordcloud(df['text'])
+            df = compact_string_columns(df)
+            write_enriched_cache(df, file_path, data_version)
         else:
              st.error("CSV file must contain a 'text' column.")
              st.stop()
@@ -78,50 +163,83 @@ def load_data(file_path="tweets.csv"):
         st.error(f"Error loading data: {e}")
         st.stop()
 
-@st.cache_data
-def generate_word_cloud(texts_series):
-    full_text = " ".join(texts_series.astype(str))
-    custom_stopwords = set(STOPWORDS)
+MAX_CACHED_TOPICS = 32
+
+def filter_topic(df, topic):
+    topic_code = df['topic'].cat.categories.get_loc(topic)
+    return df.iloc[np.flatnonzero(df['topic'].cat.codes.to_numpy() == topic_code)]
+
+@st.cache_resource(max_entries=1)
+def build_topic_index(_df, data_version):
+    return {topic: filter_topic(_df, topic).reset_index(drop=True) for topic in _df['topic'].cat.categories}
+
+@st.cache_data(max_entries=MAX_CACHED_TOPICS)
+def sentiment_summary(_df, topic, data_version):
+    codes = _df['sentiment'].cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(SENTIMENT_DTYPE.categories))
+    return pd.Series(counts, index=pd.Index(SENTIMENT_DTYPE.categories, name='sentiment'), name='count')
 
-    if full_text.strip():
+@st.cache_data(max_entries=MAX_CACHED_TOPICS)
+def entity_summary(_df, topic, data_version):
+    if 'entities' not in _df.columns:
+        return []
+    entities = pc.list_flatten(pa.array(_df['entities'].array))
+    entity_table = pa.table({'text': pc.struct_field(entities, 'text'), 'label': pc.struct_field(entities, 'label')})
+    entity_counts = entity_table.group_by(['text', 'label'], use_threads=False).aggregate([([], 'count_all')])
+    entity_counts = entity_counts.take(pc.sort_indices(entity_counts, sort_keys=[('count_all', 'descending')]))
+    return [((row['text'], row['label']), row['count_all']) for row in entity_counts.slice(0, 20).to_pylist()]
+
+@st.cache_data(max_entries=MAX_CACHED_TOPICS)
+def generate_word_cloud(_texts_series, topic, data_version):
+    tokens = _texts_series.str.split().explode().dropna()
+    tokens = tokens[~tokens.isin(STOPWORDS)]
+
+    if not tokens.empty:
+        word_frequencies = tokens.value_counts().head(200).to_dict()
         wordcloud = WordCloud(width=800, height=400,
                             background_color='white',
-                            stopwords=custom_stopwords,
-                            min_font_size=10).generate(full_text)
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.imshow(wordcloud, interpolation='bilinear')
-        ax.axis("off")
-        plt.tight_layout(pad=0)
-        return fig
+                            min_font_size=10).generate_from_frequencies(word_frequencies)
+        return wordcloud.to_image()
     else:
         return None
 
+def sample_tweets_by_sentiment(df, k=5):
+    rng = np.random.default_rng()
+    codes = df['sentiment'].cat.codes.to_numpy()
+    samples = {}
+    for label in ('Positive', 'Negative'):
+        positions = np.flatnonzero(codes == SENTIMENT_DTYPE.categories.get_loc(label))
+        chosen = rng.choice(positions, size=min(k, len(positions)), replace=False)
+        samples[label] = df['text'].iloc[chosen].tolist()
+    return samples
+
 def main():
     st.set_page_config(page_title="Advanced Twitter Analysis", layout="wide")
     st.title("🐦 Advanced Twitter Sentiment, Entity & Word Cloud Tracker")
     st.markdown("Dashboard analyzing sentiment (VADER), extracting entities (spaCy), and visualizing word frequency from a saved dataset.")
 
-    df_all_tweets = load_data()
+    data_version = csv_data_version("tweets.csv")
+    df_all_tweets = load_data("tweets.csv", data_version)
 
     if df_all_tweets is None or df_all_tweets.empty:
         st.error("Failed to load tweet data. Cannot proceed.")
         return
 
     st.sidebar.header("Filter Parameters")
-    available_topics = ["All Topics"] + sorted(df_all_tweets['topic'].unique().tolist())
+    topic_groups = build_topic_index(df_all_tweets, data_version)
+    available_topics = ["All Topics"] + sorted(topic_groups)
     query_topic = st.sidebar.selectbox("Select a topic to analyze:", available_topics)
 
     if query_topic == "All Topics":
-        df_filtered = df_all_tweets.copy()
+        df_filtered = df_all_tweets
         st.subheader("Overall Analysis (All Topics)")
     else:
-        df_filtered = df_all_tweets[df_all_tweets['topic'] == query_topic].copy()
+        df_filtered = topic_groups[query_topic]
         st.subheader(f"Analysis for '{query_topic}'")
 
     if not df_filtered.empty:
         st.markdown("### Sentiment Analysis (VADER)")
-        sentiment_counts = df_filtered['sentiment'].value_counts()
-        sentiment_counts = sentiment_counts.reindex(['Positive', 'Neutral', 'Negative'], fill_value=0)
+        sentiment_counts = sentiment_summary(df_filtered, query_topic, data_version)
         sentiment_df = pd.DataFrame({'Sentiment': sentiment_counts.index, 'Tweets': sentiment_counts.values})
         col1_sent, col2_sent = st.columns([1, 2])
         with col1_sent:
@@ -131,14 +249,8 @@ def main():
             st.bar_chart(sentiment_df.set_index('Sentiment'))
 
         st.markdown("### Named Entity Recognition (spaCy)")
-        all_entities = []
-        if 'entities' in df_filtered.columns and not df_filtered['entities'].isnull().all():
-             for entity_list in df_filtered['entities']:
-                 if isinstance(entity_list, list):
-                     all_entities.extend(entity_list)
-        if all_entities:
-            entity_counts = Counter(all_entities)
-            common_entities = entity_counts.most_common(20)
+        common_entities = entity_summary(df_filtered, query_topic, data_version)
+        if common_entities:
             entity_dict = {'PERSON': [], 'ORG': [], 'GPE': [], 'PRODUCT': [], 'EVENT': [], 'OTHER': []}
             for (text, label), count in common_entities:
                 key = label if label in entity_dict else 'OTHER'
@@ -158,9 +270,9 @@ def main():
 
         st.markdown("### Common Words Cloud")
         if 'cleaned_text' in df_filtered.columns:
-            wordcloud_fig = generate_word_cloud(df_filtered['cleaned_text'])
-            if wordcloud_fig:
-                 st.pyplot(wordcloud_fig, use_container_width=True)
+            wordcloud_image = generate_word_cloud(df_filtered['cleaned_text'], query_topic, data_version)
+            if wordcloud_image is not None:
+                 st.image(wordcloud_image, width="stretch")
             else:
                  st.info("Not enough text data to generate a word cloud for this selection.")
         else:
@@ -171,16 +283,16 @@ def main():
         existing_cols = [col for col in display_cols if col in df_filtered.columns]
         st.dataframe(df_filtered[existing_cols].style.format({'vader_score': "{:.2f}"}), use_container_width=True)
 
+        sampled_tweets = sample_tweets_by_sentiment(df_filtered)
+
         st.subheader("Sample Positive Tweets")
-        positive_tweets_series = df_filtered[df_filtered['sentiment'] == 'Positive']['text']
-        if not positive_tweets_series.empty:
-            num_samples = min(5, len(positive_tweets_series)); [st.markdown(f"> {t}") for t in positive_tweets_series.sample(num_samples).tolist()]
+        if sampled_tweets['Positive']:
+            [st.markdown(f"> {t}") for t in sampled_tweets['Positive']]
         else: st.info(f"No positive tweets found.")
 
         st.subheader("Sample Negative Tweets")
-        negative_tweets_series = df_filtered[df_filtered['sentiment'] == 'Negative']['text']
-        if not negative_tweets_series.empty:
-             num_samples = min(5, len(negative_tweets_series)); [st.markdown(f"> {t}") for t in negative_tweets_series.sample(num_samples).tolist()]
+        if sampled_tweets['Negative']:
+             [st.markdown(f"> {t}") for t in sampled_tweets['Negative']]
         else: st.info(f"No negative tweets found.")
 
     else:
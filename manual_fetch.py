@@ -1,90 +1,160 @@
 import tweepy
 import pandas as pd
+import numpy as np
 from dotenv import load_dotenv
 import os
 import re
-from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import json
+import functools
+import math
+import asyncio
+import itertools
+import hashlib
+import time
+
+load_dotenv()
+BEARER_TOKENS = [token.strip() for token in (os.getenv("BEARER_TOKENS") or os.getenv("BEARER_TOKEN") or "").split(",")
+                 if token.strip()]
+TOPICS = ["#Python"]
+SENTIMENT_LABELS = ['Positive', 'Neutral', 'Negative']
+
+analyzer = SentimentIntensityAnalyzer()
+
+CLEAN_RE = re.compile(r"(@[A-Za-z0-9]+)|([^0-9A-Za-z \t])|(\w+://\S+)")
 
 def clean_tweet(tweet):
-    return ' '.join(re.sub(r"(@[A-Za-z0-9]+)|([^0-9A-Za-z \t])|(\w+:\/\/\S+)", " ", tweet).split())
+    return ' '.join(CLEAN_RE.sub(" ", tweet).split())
 
-def get_tweet_sentiment(tweet):
-    analysis = TextBlob(clean_tweet(tweet))
-    if analysis.sentiment.polarity > 0: return 'Positive'
-    elif analysis.sentiment.polarity == 0: return 'Neutral'
-    else: return 'Negative'
+MAX_VADER_CHARS = 400
 
-def get_sentiment_polarity(tweet):
-    analysis = TextBlob(clean_tweet(tweet))
-    return analysis.sentiment.polarity
+def has_lexicon_token(text):
+    return any(word.lower() in analyzer.lexicon for word in text.split())
 
-def fetch_one_batch():
-    load_dotenv()
-    BEARER_TOKEN = os.getenv("BEARER_TOKEN")
-    
-    if not BEARER_TOKEN:
-        print("Error: BEARER_TOKEN not found in .env file.")
+@functools.lru_cache(maxsize=4096)
+def vader_compound(text):
+    cleaned = clean_tweet(text)[:MAX_VADER_CHARS]
+    if not has_lexicon_token(cleaned):
+        return 0.0
+    return analyzer.polarity_scores(cleaned)['compound']
+
+def analyze_sentiment(texts):
+    scores = np.fromiter((vader_compound(text) for text in texts), dtype=np.float32, count=len(texts))
+    labels = np.select([scores >= 0.05, scores <= -0.05], ['Positive', 'Negative'], default='Neutral')
+    return labels, scores
+
+TWEETS_PER_PAGE = 100
+TWEET_URL_PREFIX = "https://twitter.com/"
+TWEET_URL_STATUS = "/status/"
+SEARCH_CACHE_DIR = os.path.join(".cache", "search")
+SEARCH_CACHE_TTL_SECONDS = 300
+
+@functools.lru_cache(maxsize=None)
+def get_tweepy_client(bearer_token):
+    return tweepy.Client(bearer_token, wait_on_rate_limit=False)
+
+def search_cache_path(query, count):
+    return os.path.join(SEARCH_CACHE_DIR, hashlib.md5(f"{query}:{count}".encode()).hexdigest() + ".json")
+
+def read_search_cache(query, count):
+    try:
+        with open(search_cache_path(query, count)) as cache_file:
+            entry = json.load(cache_file)
+        if time.time() - entry['fetched_at'] > SEARCH_CACHE_TTL_SECONDS:
+            return None
+        return {name: list(entry['columns'][name]) for name in ('text', 'user', 'url')}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def write_search_cache(query, count, columns):
+    try:
+        os.makedirs(SEARCH_CACHE_DIR, exist_ok=True)
+        with open(search_cache_path(query, count), "w") as cache_file:
+            json.dump({'fetched_at': time.time(), 'columns': columns}, cache_file)
+    except OSError:
+        pass
+
+def search_tweets(client, full_query, count):
+    pages = tweepy.Paginator(
+        client.search_recent_tweets,
+        query=full_query,
+        max_results=max(10, min(count, TWEETS_PER_PAGE)),
+        expansions=['author_id'],
+        user_fields=['username'],
+        limit=math.ceil(count / TWEETS_PER_PAGE)
+    )
+    tweets, users = [], {}
+    for response in pages:
+        tweets.extend(response.data or [])
+        if 'users' in response.includes:
+             users.update((user.id, user) for user in response.includes['users'])
+    tweets = tweets[:count]
+
+    authors = [users.get(tweet.author_id) for tweet in tweets]
+    return {
+        'text': [tweet.text for tweet in tweets],
+        'user': [user.username if user else "UnknownUser" for user in authors],
+        'url': [TWEET_URL_PREFIX + (user.username if user else 'i') + TWEET_URL_STATUS + str(tweet.id)
+                for user, tweet in zip(authors, tweets)],
+    }
+
+def fetch_one_batch(topic, count=50, bearer_token=None):
+    if not BEARER_TOKENS:
+        print("Error: neither BEARER_TOKENS nor BEARER_TOKEN found in .env file.")
         return None
 
     try:
-        client = tweepy.Client(BEARER_TOKEN, wait_on_rate_limit=False) 
+        client = get_tweepy_client(bearer_token or BEARER_TOKENS[0])
         print("Authenticated successfully...")
     except Exception as e:
         print(f"Error authenticating: {e}")
         return None
 
-    topic = "#Python"
     full_query = f"{topic} lang:en -is:retweet"
-    all_tweets_data = []
 
-    print(f"Attempting to fetch 50 tweets for: {topic}...")
-    try:
-        response = client.search_recent_tweets(
-            query=full_query, 
-            max_results=50, 
-            expansions=['author_id'],
-            user_fields=['username'],
-            tweet_fields=['created_at']
-        )
-        
-        if response.data:
-            print(f"Success! Found {len(response.data)} tweets.")
-            users = {}
-            if 'users' in response.includes:
-                 users = {user.id: user for user in response.includes['users']}
-            
-            for tweet in response.data:
-                parsed_tweet = {}
-                user = users.get(tweet.author_id)
-                
-                parsed_tweet['topic'] = topic 
-                parsed_tweet['text'] = tweet.text
-                parsed_tweet['sentiment'] = get_tweet_sentiment(tweet.text)
-                parsed_tweet['polarity'] = get_sentiment_polarity(tweet.text)
-                parsed_tweet['user'] = user.username if user else "UnknownUser"
-                parsed_tweet['url'] = f"https://twitter.com/{user.username if user else 'i'}/status/{tweet.id}"
-                
-                all_tweets_data.append(parsed_tweet)
-            return all_tweets_data
-            
-        else:
-            print("No tweets found.")
+    columns = read_search_cache(full_query, count)
+    if columns is not None:
+        print(f"Using cached tweets for: {topic}...")
+    else:
+        print(f"Attempting to fetch {count} tweets for: {topic}...")
+        try:
+            columns = search_tweets(client, full_query, count)
+        except tweepy.errors.TooManyRequests:
+            print("\n--- RATE LIMIT HIT ---")
+            print("The API is on cooldown. Please wait 15 minutes and try running this script again.")
+            return None
+        except Exception as e:
+            print(f"\nAn error occurred: {e}")
             return None
+        if columns['text']:
+            write_search_cache(full_query, count, columns)
 
-    except tweepy.errors.TooManyRequests:
-        print("\n--- RATE LIMIT HIT ---")
-        print("The API is on cooldown. Please wait 15 minutes and try running this script again.")
-        return None
-    except Exception as e:
-        print(f"\nAn error occurred: {e}")
+    if columns['text']:
+        print(f"Success! Found {len(columns['text'])} tweets.")
+        labels, scores = analyze_sentiment(columns['text'])
+        return pd.DataFrame({
+            'topic': topic,
+            'text': columns['text'],
+            'sentiment': pd.Categorical(labels, categories=SENTIMENT_LABELS),
+            'vader_score': scores,
+            'user': columns['user'],
+            'url': columns['url'],
+        })
+    else:
+        print("No tweets found.")
         return None
 
+async def fetch_topics(topics, count=50):
+    bearer_tokens = itertools.cycle(BEARER_TOKENS or [None])
+    batches = await asyncio.gather(*(asyncio.to_thread(fetch_one_batch, topic, count, next(bearer_tokens))
+                                     for topic in topics))
+    batches = [batch for batch in batches if batch is not None]
+    return pd.concat(batches, ignore_index=True) if batches else None
+
 if __name__ == "__main__":
-    tweet_list = fetch_one_batch()
+    df = asyncio.run(fetch_topics(TOPICS))
     
-    if tweet_list:
-        df = pd.DataFrame(tweet_list)
+    if df is not None:
         df.to_csv("tweets.csv", index=False)
         print(f"\nSuccessfully saved {len(df)} tweets to tweets.csv")
     else: